@@ -5,10 +5,15 @@ A "Six Degrees of Separation" style game for football players.
 Find connections between any two players through their shared teammates.
 """
 
+from functools import partial
+
+import numpy as np
+import pandas as pd
 import streamlit as st
 
 from src.config import APP_TITLE, APP_ICON, DIFFICULTY_SETTINGS
-from src.data.loader import load_data
+from src.data.loader import load_data, get_player_details, PlayerGraph
+from src.data.search import PlayerSearchIndex
 from src.game.explorer import render_explorer_mode
 from src.game.quiz import (
     initialize_quiz_state,
@@ -29,6 +34,8 @@ from src.ui.components import (
     render_hint_box,
     render_success_message,
     render_error_message,
+    render_player_matches,
+    render_player_query,
 )
 
 
@@ -42,13 +49,13 @@ st.set_page_config(
 
 
 def render_quiz_mode(
-    display_names: list,
-    display_to_id: dict,
-    id_to_display: dict,
-    player_id_to_name: dict,
-    teammate_graph: dict,
-    teammate_stats: dict,
-    player_details: dict,
+    n_players: int,
+    display_to_idx: dict,
+    idx_to_display: np.ndarray,
+    player_names: np.ndarray,
+    player_details: pd.DataFrame,
+    player_graph: PlayerGraph,
+    search_index: PlayerSearchIndex,
 ) -> None:
     """Render the Quiz Mode UI."""
 
@@ -100,7 +107,7 @@ def render_quiz_mode(
         )
 
         if st.button(button_label, type="primary", use_container_width=True):
-            if start_new_quiz(display_names, display_to_id, teammate_graph, difficulty):
+            if start_new_quiz(idx_to_display, n_players, player_graph, difficulty):
                 st.rerun()
             else:
                 st.error(
@@ -117,8 +124,8 @@ def render_quiz_mode(
 
         render_quiz_header(difficulty, difficulty_emoji, degrees - 1)
         render_quiz_players(
-            player_id_to_name.get(path[0], "Unknown"),
-            player_id_to_name.get(path[-1], "Unknown"),
+            player_names[path[0]],
+            player_names[path[-1]],
         )
 
         st.markdown("---")
@@ -126,8 +133,8 @@ def render_quiz_mode(
 
         # Render the chain
         all_guessed = True
-        for i, player_id in enumerate(path):
-            player_name = player_id_to_name.get(player_id, str(player_id))
+        for i, player in enumerate(path):
+            player_name = player_names[player]
 
             if st.session_state.quiz_guessed[i]:
                 icon = "⚽" if i == 0 or i == len(path) - 1 else "✅"
@@ -157,47 +164,60 @@ def render_quiz_mode(
 
             st.info(f"Guess player #{next_to_guess + 1} in the chain")
 
-            guess = st.selectbox(
-                "Your guess:",
-                options=display_names,
-                index=None,
-                placeholder="🔍 Type player name...",
-                key=f"quiz_guess_{next_to_guess}",
-            )
+            guess_key = f"quiz_guess_{next_to_guess}"
+            query = render_player_query("Your guess:", guess_key)
+
+            with st.form("quiz_guess_form", border=False):
+                guess = render_player_matches(
+                    "Your guess:", guess_key, query, search_index
+                )
 
-            col1, col2, col3 = st.columns(3)
-
-            with col1:
-                if st.button("✅ Submit Guess", use_container_width=True):
-                    if guess:
-                        guessed_id = display_to_id.get(guess)
-                        correct_id = path[next_to_guess]
-
-                        if check_guess(guessed_id, correct_id, next_to_guess):
-                            st.balloons()
-                            st.rerun()
-                        else:
-                            render_error_message("❌ Wrong! Try again or use a hint.")
-
-            with col2:
-                if st.button("💡 Get Hint", use_container_width=True):
-                    correct_id = path[next_to_guess]
-                    current_level = st.session_state.quiz_hint_level.get(
-                        next_to_guess, 0
-                    )
-
-                    st.session_state.quiz_hint_level[next_to_guess] = current_level + 1
-                    st.session_state.quiz_hints_used += 1
-
-                    hint_header, hint_text = build_hint_text(
-                        correct_id, player_id_to_name, player_details, current_level
-                    )
-                    render_hint_box(hint_header, hint_text)
-
-            with col3:
-                if st.button("🏳️ Show Answer", use_container_width=True):
-                    reveal_answer(next_to_guess)
-                    st.rerun()
+                col1, col2, col3 = st.columns(3)
+
+                with col1:
+                    if st.form_submit_button(
+                        "✅ Submit Guess", use_container_width=True
+                    ):
+                        if guess:
+                            guessed = display_to_idx.get(guess)
+                            correct = path[next_to_guess]
+
+                            if check_guess(guessed, correct, next_to_guess):
+                                st.balloons()
+                                st.rerun()
+                            else:
+                                render_error_message(
+                                    "❌ Wrong! Try again or use a hint."
+                                )
+
+                with col2:
+                    if st.form_submit_button(
+                        "💡 Get Hint", use_container_width=True
+                    ):
+                        correct = path[next_to_guess]
+                        current_level = st.session_state.quiz_hint_level.get(
+                            next_to_guess, 0
+                        )
+
+                        st.session_state.quiz_hint_level[next_to_guess] = (
+                            current_level + 1
+                        )
+                        st.session_state.quiz_hints_used += 1
+
+                        hint_header, hint_text = build_hint_text(
+                            correct,
+                            player_names,
+                            partial(get_player_details, player_details),
+                            current_level,
+                        )
+                        render_hint_box(hint_header, hint_text)
+
+                with col3:
+                    if st.form_submit_button(
+                        "🏳️ Show Answer", use_container_width=True
+                    ):
+                        reveal_answer(next_to_guess)
+                        st.rerun()
         else:
             render_success_message(
                 "🎉 Congratulations! You found the complete connection!"
@@ -214,17 +234,18 @@ def main():
     # Load data
     with st.spinner("🔄 Loading player database..."):
         (
+            n_players,
             display_names,
-            display_to_id,
-            id_to_display,
-            player_id_to_name,
-            teammate_graph,
-            teammate_stats,
+            display_to_idx,
+            idx_to_display,
+            player_names,
             player_details,
+            player_graph,
+            search_index,
         ) = load_data()
 
     # Render header with stats
-    render_header(display_names, teammate_graph)
+    render_header(display_names, player_graph)
 
     # Navigation bar (mode selector + theme toggle)
     mode = render_nav_bar()
@@ -232,21 +253,20 @@ def main():
     # Render selected mode
     if mode == "🔍 Explorer Mode":
         render_explorer_mode(
-            display_names,
-            display_to_id,
-            player_id_to_name,
-            teammate_graph,
-            teammate_stats,
+            search_index,
+            display_to_idx,
+            player_names,
+            player_graph,
         )
     else:
         render_quiz_mode(
-            display_names,
-            display_to_id,
-            id_to_display,
-            player_id_to_name,
-            teammate_graph,
-            teammate_stats,
+            n_players,
+            display_to_idx,
+            idx_to_display,
+            player_names,
             player_details,
+            player_graph,
+            search_index,
         )
 
     # Render footer
@@ -11,6 +11,9 @@ APP_TAGLINE = "Discover how football players are connected through their teammat
 PLAYER_PROFILES_PATH = "data/player_profiles.csv"
 PLAYER_TEAMMATES_PATH = "data/player_teammates_played_with.csv"
 
+# Processed data is cached here between restarts
+DATA_CACHE_DIR = "data/.cache"
+
 # Difficulty settings for Quiz Mode
 DIFFICULTY_SETTINGS = {
     "Easy": {
@@ -40,6 +43,11 @@ DIFFICULTY_SETTINGS = {
 MAX_QUIZ_ATTEMPTS = 100
 MIN_ELIGIBLE_PLAYERS = 100
 MAX_HINT_LEVELS = 5
+QUIZ_BUCKET_SOURCES = 512  # Players sampled to precompute quiz pairs from
+
+# Player search settings
+MIN_SEARCH_CHARS = 2
+MAX_SEARCH_RESULTS = 50
 
 # Theme configurations
 DEFAULT_THEME = "dark"  # Default to dark theme
@@ -1,4 +1,11 @@
 # Data loading and processing module
-from .loader import load_data
+from .loader import load_data, PlayerData, PlayerGraph
+from .search import search_players, PlayerSearchIndex
 
-__all__ = ["load_data"]
+__all__ = [
+    "load_data",
+    "PlayerData",
+    "PlayerGraph",
+    "search_players",
+    "PlayerSearchIndex",
+]
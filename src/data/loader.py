@@ -2,135 +2,424 @@
 Data loading and graph building module.
 """
 
+import os
+import pickle
 import re
 from datetime import datetime
-from collections import defaultdict
-from typing import Tuple, Dict, Set, List, Any
+from functools import partial
+from typing import Tuple, Dict, List, Any, NamedTuple, Callable, BinaryIO
 
+import numpy as np
 import pandas as pd
 import streamlit as st
+from numba import njit
 
-from ..config import PLAYER_PROFILES_PATH, PLAYER_TEAMMATES_PATH
+from ..config import PLAYER_PROFILES_PATH, PLAYER_TEAMMATES_PATH, DATA_CACHE_DIR
+from .search import PlayerSearchIndex, build_search_index
 
+# Transfermarkt disambiguates namesakes with a trailing "(123)"
+_NAME_SUFFIX_RE = re.compile(r"\s*\(\d+\)$")
 
-def _clean_player_name(name: str) -> str:
-    """Remove trailing disambiguation numbers from player names."""
-    if pd.isna(name):
-        return name
-    cleaned = re.sub(r"\s*\(\d+\)$", "", str(name))
-    return cleaned.strip()
 
+class PlayerGraph(NamedTuple):
+    """
+    Teammate graph in compressed sparse row (CSR) form.
 
-def _calculate_age(dob: Any, current_year: int) -> int | None:
-    """Calculate age from date of birth string."""
-    if pd.isna(dob):
-        return None
-    try:
-        birth_year = int(str(dob)[:4])
-        return current_year - birth_year
-    except (ValueError, TypeError):
-        return None
+    The teammates of the player at dense index ``u`` are
+    ``indices[indptr[u]:indptr[u + 1]]``, sorted ascending. ``minutes`` and
+    ``goals`` are aligned with ``indices`` and hold the pair's stats, with 0
+    meaning unknown. ``idx_to_id`` maps dense indices back to player IDs,
+    ``degree`` holds each player's teammate count, ``component`` labels
+    the connected component each player belongs to and ``component_size``
+    holds the size of that component.
+    """
 
+    indptr: np.ndarray
+    indices: np.ndarray
+    idx_to_id: np.ndarray
+    minutes: np.ndarray
+    goals: np.ndarray
+    degree: np.ndarray
+    component: np.ndarray
+    component_size: np.ndarray
 
-def _get_safe_value(row: pd.Series, key: str, default: str = "Unknown") -> str:
-    """Safely get a value from a row with fallback."""
-    value = row.get(key, default)
-    return default if pd.isna(value) else value
 
+class PlayerData(NamedTuple):
+    """
+    Everything the app needs from the player and teammate CSVs.
+
+    Players are identified by a dense index ``0..N-1`` rather than their
+    Transfermarkt ID, so per-player lookups are plain array indexing. Players
+    with a profile come first; teammates without one follow.
 
-@st.cache_data(show_spinner=False)
-def load_data() -> Tuple[
-    List[str],
-    Dict[str, int],
-    Dict[int, str],
-    Dict[int, str],
-    Dict[int, Set[int]],
-    Dict[Tuple[int, int], Dict[str, Any]],
-    Dict[int, Dict[str, Any]],
-]:
+    - n_players: Number of players with a profile (indices 0..n_players-1)
+    - display_names: Sorted list of player display names
+    - display_to_idx: Mapping from display name to player index
+    - idx_to_display: Display name per player index (None without a profile)
+    - player_names: Clean name per player index
+    - player_details: Detailed player info for hints, one row per profiled
+      player index (see get_player_details)
+    - player_graph: CSR form of the teammate graph used for pathfinding
+    - search_index: Prefix index over display_names for player search
     """
-    Load player data and build the teammate graph.
+
+    n_players: int
+    display_names: List[str]
+    display_to_idx: Dict[str, int]
+    idx_to_display: np.ndarray
+    player_names: np.ndarray
+    player_details: pd.DataFrame
+    player_graph: PlayerGraph
+    search_index: PlayerSearchIndex
+
+
+@njit(cache=True)
+def _label_components(indptr, indices):
+    """Label every node with the smallest-numbered node of its component."""
+    n_nodes = len(indptr) - 1
+    component = np.full(n_nodes, -1, dtype=np.int32)
+    queue = np.empty(n_nodes, dtype=np.int32)
+
+    for root in range(n_nodes):
+        if component[root] != -1:
+            continue
+
+        component[root] = root
+        queue[0] = root
+        head, tail = 0, 1
+        while head < tail:
+            current = queue[head]
+            head += 1
+            for k in range(indptr[current], indptr[current + 1]):
+                neighbor = indices[k]
+                if component[neighbor] == -1:
+                    component[neighbor] = root
+                    queue[tail] = neighbor
+                    tail += 1
+
+    return component
+
+
+def _build_csr(
+    n_nodes: int,
+    source_idx: np.ndarray,
+    target_idx: np.ndarray,
+    idx_to_id: np.ndarray,
+    df_teammates: pd.DataFrame,
+) -> PlayerGraph:
+    """Build the undirected CSR teammate graph from a de-duplicated edge list."""
+    src = np.concatenate([source_idx, target_idx])
+    dst = np.concatenate([target_idx, source_idx])
+    order = np.lexsort((dst, src))
+
+    indptr = np.zeros(n_nodes + 1, dtype=np.int32)
+    np.cumsum(np.bincount(src, minlength=n_nodes), out=indptr[1:])
+    indices = dst[order].astype(np.int32)
+
+    # Missing stats become 0 so the renderer only needs a truthiness check.
+    # Joint goals comfortably fit in int16; minutes can exceed its range.
+    minutes = np.tile(
+        df_teammates["minutes_played_with"].fillna(0).to_numpy(dtype=np.int32), 2
+    )[order]
+    goals = np.tile(
+        df_teammates["joint_goal_participation"].fillna(0).to_numpy(dtype=np.int16), 2
+    )[order]
+
+    degree = np.diff(indptr)
+    component = _label_components(indptr, indices)
+    # Components are labelled by their smallest node, so labels index bincount
+    component_size = np.bincount(component, minlength=n_nodes).astype(np.int32)[
+        component
+    ]
+
+    return PlayerGraph(
+        indptr, indices, idx_to_id, minutes, goals, degree, component, component_size
+    )
+
+
+def get_teammate_stats(
+    player_graph: PlayerGraph, player: int, teammate: int
+) -> Tuple[int | None, int | None]:
+    """
+    Look up the stats for a pair of teammates, given their player indices.
 
     Returns:
-        Tuple containing:
-        - display_names: Sorted list of player display names
-        - display_to_id: Mapping from display name to player ID
-        - id_to_display: Mapping from player ID to display name
-        - player_id_to_name: Mapping from player ID to clean name
-        - teammate_graph: Adjacency list of teammate connections
-        - teammate_stats: Stats for each teammate pair
-        - player_details: Detailed player info for hints
+        Tuple of (minutes played together, joint goal participations), each
+        None when unknown
     """
-    df_players = pd.read_csv(PLAYER_PROFILES_PATH, low_memory=False)
-    df_teammates = pd.read_csv(PLAYER_TEAMMATES_PATH)
+    # Stats are stored in both directions, so search the shorter neighbour list
+    indptr = player_graph.indptr
+    if indptr[teammate + 1] - indptr[teammate] < indptr[player + 1] - indptr[player]:
+        player, teammate = teammate, player
 
-    df_players = df_players.dropna(subset=["player_name"])
-    df_players["clean_name"] = df_players["player_name"].apply(_clean_player_name)
+    start = indptr[player]
+    end = indptr[player + 1]
+    pos = start + np.searchsorted(player_graph.indices[start:end], teammate)
+    if pos == end or player_graph.indices[pos] != teammate:
+        return None, None
 
-    player_id_to_name = df_players.set_index("player_id")["clean_name"].to_dict()
-    current_year = datetime.now().year
+    minutes = int(player_graph.minutes[pos])
+    goals = int(player_graph.goals[pos])
+    return minutes or None, goals or None
 
-    display_names = []
-    display_to_id = {}
-    id_to_display = {}
-    player_details = {}
 
-    for _, row in df_players.iterrows():
-        player_id = row["player_id"]
-        player_name = row["clean_name"]
+def get_player_details(player_details: pd.DataFrame, player: int) -> Dict[str, Any]:
+    """Build the hint details dict for one player index (empty if unknown)."""
+    if player >= len(player_details):
+        return {}
 
-        if pd.isna(player_name):
-            continue
+    details = player_details.iloc[player].to_dict()
+    details["age"] = None if pd.isna(details["age"]) else int(details["age"])
+    return details
 
-        dob = row.get("date_of_birth", None)
-        age = _calculate_age(dob, current_year)
-        age_str = f", {age} yrs" if age else ""
-
-        club = _get_safe_value(row, "current_club_name")
-        display_name = f"{player_name} ({club}{age_str})"
-
-        display_names.append(display_name)
-        display_to_id[display_name] = player_id
-        id_to_display[player_id] = display_name
-
-        # Store player details for hints
-        player_details[player_id] = {
-            "name": player_name,
-            "club": club,
-            "nationality": _get_safe_value(row, "citizenship"),
-            "position": _get_safe_value(row, "position"),
-            "country_of_birth": _get_safe_value(row, "country_of_birth"),
-            "age": age,
-        }
 
-    display_names = sorted(
-        [name for name in set(display_names) if isinstance(name, str)]
+def _clean_player_names(names: pd.Series) -> pd.Series:
+    """Remove trailing disambiguation numbers from player names."""
+    return names.str.replace(_NAME_SUFFIX_RE, "", regex=True).str.strip()
+
+
+def _calculate_ages(dob: pd.Series, current_year: int) -> pd.Series:
+    """Calculate ages from date of birth strings."""
+    birth_year = pd.to_numeric(dob.astype("string").str.slice(0, 4), errors="coerce")
+    return (current_year - birth_year).astype("Int64")
+
+
+def _build_player_data(current_year: int) -> PlayerData:
+    """Parse the CSVs and build the PlayerData bundle from scratch."""
+    df_players = pd.read_csv(
+        PLAYER_PROFILES_PATH,
+        engine="pyarrow",
+        usecols=[
+            "player_id",
+            "player_name",
+            "date_of_birth",
+            "current_club_name",
+            "citizenship",
+            "position",
+            "country_of_birth",
+        ],
+        dtype={"player_id": "int32"},
     )
+    df_teammates = pd.read_csv(
+        PLAYER_TEAMMATES_PATH,
+        engine="pyarrow",
+        usecols=[
+            "player_id",
+            "teammate_player_id",
+            "minutes_played_with",
+            "joint_goal_participation",
+        ],
+        dtype={
+            "player_id": "int32",
+            "teammate_player_id": "int32",
+            "minutes_played_with": "float32",
+        },
+    )
+
+    df_players = df_players.dropna(subset=["player_name"]).reset_index(drop=True)
+    df_players["clean_name"] = _clean_player_names(df_players["player_name"])
+    n_players = len(df_players)
 
-    # Build teammate graph
-    teammate_graph = defaultdict(set)
-    teammate_stats = {}
+    # Each teammate pair is kept once (last row wins) so both directions
+    # carry the same stats; the graph mirrors it to make it undirected.
+    pairs = df_teammates[["player_id", "teammate_player_id"]]
+    df_teammates = df_teammates.assign(
+        low_id=pairs.min(axis=1), high_id=pairs.max(axis=1)
+    ).drop_duplicates(subset=["low_id", "high_id"], keep="last")
+    n_edges = len(df_teammates)
 
-    for _, row in df_teammates.iterrows():
-        player_id = row["player_id"]
-        teammate_id = row["teammate_player_id"]
+    # Dense player indices: profiled players keep their row order (profile IDs
+    # are unique), teammates without a profile are appended after them.
+    codes, idx_to_id = pd.factorize(
+        pd.concat(
+            [
+                df_players["player_id"],
+                df_teammates["player_id"],
+                df_teammates["teammate_player_id"],
+            ],
+            ignore_index=True,
+        )
+    )
+    idx_to_id = np.asarray(idx_to_id)
+    n_nodes = len(idx_to_id)
+    source_idx = codes[n_players : n_players + n_edges]
+    target_idx = codes[n_players + n_edges :]
 
-        teammate_graph[player_id].add(teammate_id)
-        teammate_graph[teammate_id].add(player_id)
+    player_names = np.empty(n_nodes, dtype=object)
+    player_names[:n_players] = df_players["clean_name"].to_numpy(dtype=object)
+    player_names[n_players:] = idx_to_id[n_players:].astype(str)
 
-        minutes = row.get("minutes_played_with", None)
-        goals = row.get("joint_goal_participation", None)
-        stats = {"minutes": minutes, "goals": goals}
+    ages = _calculate_ages(df_players["date_of_birth"], current_year)
+    has_age = (ages.notna() & (ages != 0)).fillna(False).astype(bool)
+    age_str = (", " + ages.astype("string") + " yrs").where(has_age, "")
 
-        teammate_stats[(player_id, teammate_id)] = stats
-        teammate_stats[(teammate_id, player_id)] = stats
+    # Clubs, countries and positions repeat across thousands of players, so
+    # they are stored once each as categories rather than per row.
+    unknown = {
+        column: df_players[column].fillna("Unknown").astype("category")
+        for column in ("current_club_name", "citizenship", "position", "country_of_birth")
+    }
+    display_series = (
+        df_players["clean_name"]
+        + " ("
+        + unknown["current_club_name"].astype("string")
+        + age_str
+        + ")"
+    ).astype(object)
 
-    return (
+    display_names = display_series.tolist()
+    display_to_idx = dict(zip(display_names, range(n_players)))
+    idx_to_display = np.empty(n_nodes, dtype=object)
+    idx_to_display[:n_players] = display_names
+
+    # Player details for hints are only turned into dicts on demand
+    player_details = pd.DataFrame(
+        {
+            "name": df_players["clean_name"],
+            "club": unknown["current_club_name"],
+            "nationality": unknown["citizenship"],
+            "position": unknown["position"],
+            "country_of_birth": unknown["country_of_birth"],
+            "age": ages,
+        }
+    )
+
+    display_names = sorted(
+        [name for name in set(display_names) if isinstance(name, str)]
+    )
+
+    player_graph = _build_csr(n_nodes, source_idx, target_idx, idx_to_id, df_teammates)
+
+    return PlayerData(
+        n_players,
         display_names,
-        display_to_id,
-        id_to_display,
-        player_id_to_name,
-        dict(teammate_graph),
-        teammate_stats,
+        display_to_idx,
+        idx_to_display,
+        player_names,
         player_details,
+        player_graph,
+        build_search_index(display_names),
     )
+
+
+# Bump whenever the layout of PlayerData changes so stale caches are rebuilt
+_CACHE_VERSION = 9
+_CACHE_META_FILE = "player_data.pkl"
+# Kept apart from the bundle so it can be checked without unpickling
+# PlayerData, whose layout may have changed since the cache was written
+_CACHE_SIGNATURE_FILE = "signature.pkl"
+_CACHE_ARRAYS = (
+    "indptr",
+    "indices",
+    "idx_to_id",
+    "minutes",
+    "goals",
+    "degree",
+    "component",
+    "component_size",
+)
+
+
+def _cache_signature(current_year: int) -> Dict[str, Any]:
+    """Describe the inputs a cached bundle was built from."""
+    return {
+        "version": _CACHE_VERSION,
+        "year": current_year,
+        "mtimes": [
+            os.path.getmtime(path)
+            for path in (PLAYER_PROFILES_PATH, PLAYER_TEAMMATES_PATH)
+        ],
+    }
+
+
+def _load_cached_player_data(signature: Dict[str, Any]) -> PlayerData | None:
+    """Load the bundle from DATA_CACHE_DIR if it matches the current inputs."""
+    try:
+        with open(os.path.join(DATA_CACHE_DIR, _CACHE_SIGNATURE_FILE), "rb") as f:
+            cached_signature = pickle.load(f)
+        if cached_signature != signature:
+            return None
+
+        with open(os.path.join(DATA_CACHE_DIR, _CACHE_META_FILE), "rb") as f:
+            data = pickle.load(f)
+
+        arrays = {
+            name: np.load(os.path.join(DATA_CACHE_DIR, f"{name}.npy"), mmap_mode="r")
+            for name in _CACHE_ARRAYS
+        }
+        return data._replace(player_graph=data.player_graph._replace(**arrays))
+    except Exception:
+        # Any unreadable or mismatched cache is simply rebuilt
+        return None
+
+
+def _write_atomically(path: str, write: Callable[[BinaryIO], None]) -> None:
+    """
+    Write a cache file via a temporary file renamed into place.
+
+    A live PlayerData may still have the old file memory-mapped; replacing
+    it leaves that mapping intact, where writing in place would truncate it.
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        write(f)
+    os.replace(tmp_path, path)
+
+
+def _save_cached_player_data(data: PlayerData, signature: Dict[str, Any]) -> None:
+    """Write the bundle to DATA_CACHE_DIR, ignoring read-only filesystems."""
+    graph = data.player_graph
+    signature_path = os.path.join(DATA_CACHE_DIR, _CACHE_SIGNATURE_FILE)
+    try:
+        os.makedirs(DATA_CACHE_DIR, exist_ok=True)
+        # Invalidate first, so a save that fails partway never validates a
+        # mix of old and new files
+        if os.path.exists(signature_path):
+            os.remove(signature_path)
+
+        for name in _CACHE_ARRAYS:
+            _write_atomically(
+                os.path.join(DATA_CACHE_DIR, f"{name}.npy"),
+                partial(np.save, arr=getattr(graph, name)),
+            )
+
+        # The arrays are stored separately so they can be memory-mapped
+        stripped = data._replace(
+            player_graph=graph._replace(**{name: None for name in _CACHE_ARRAYS})
+        )
+        _write_atomically(
+            os.path.join(DATA_CACHE_DIR, _CACHE_META_FILE),
+            partial(pickle.dump, stripped, protocol=pickle.HIGHEST_PROTOCOL),
+        )
+
+        # Written last, so a half-written cache never matches
+        _write_atomically(
+            signature_path,
+            partial(pickle.dump, signature, protocol=pickle.HIGHEST_PROTOCOL),
+        )
+    except OSError:
+        pass
+
+
+@st.cache_resource(show_spinner=False)
+def load_data() -> PlayerData:
+    """
+    Load player data and build the teammate graph.
+
+    The result is cached as a shared resource: it is built once per process
+    and handed out by reference, so reruns do not hash or pickle the graph.
+    Callers must treat it as read-only. Across restarts, the processed bundle
+    is persisted to DATA_CACHE_DIR and reused while the CSVs are unchanged.
+
+    Returns:
+        PlayerData bundle (see its field list)
+    """
+    current_year = datetime.now().year
+    signature = _cache_signature(current_year)
+
+    data = _load_cached_player_data(signature)
+    if data is None:
+        data = _build_player_data(current_year)
+        _save_cached_player_data(data, signature)
+
+    return data
@@ -0,0 +1,80 @@
+"""
+Server-side player name search.
+
+Streamlit ships every selectbox option to the browser, which gets sluggish
+with tens of thousands of players. Instead, the display names are indexed
+once by lowercase prefix and only the best matches are sent to the client.
+"""
+
+from typing import List, NamedTuple
+
+import numpy as np
+
+from ..config import MIN_SEARCH_CHARS, MAX_SEARCH_RESULTS
+
+
+class PlayerSearchIndex(NamedTuple):
+    """
+    Sorted lowercase search keys pointing back into ``display_names``.
+
+    Every word of a player's name starts a key, so "messi" finds
+    "Lionel Messi (...)" as well as names that begin with it.
+    """
+
+    keys: np.ndarray
+    positions: np.ndarray
+    display_names: List[str]
+
+
+def build_search_index(display_names: List[str]) -> PlayerSearchIndex:
+    """Build the prefix index for a list of player display names."""
+    keys = []
+    positions = []
+
+    for position, display_name in enumerate(display_names):
+        lowered = display_name.lower()
+        name_end = lowered.rfind(" (")
+        if name_end == -1:
+            name_end = len(lowered)
+
+        keys.append(lowered)
+        positions.append(position)
+        for offset, char in enumerate(lowered[:name_end]):
+            if char == " ":
+                keys.append(lowered[offset + 1 :])
+                positions.append(position)
+
+    keys = np.array(keys, dtype=object)
+    order = np.argsort(keys, kind="stable")
+    return PlayerSearchIndex(
+        keys[order], np.asarray(positions, dtype=np.int32)[order], display_names
+    )
+
+
+def search_players(
+    query: str | None,
+    search_index: PlayerSearchIndex,
+    limit: int = MAX_SEARCH_RESULTS,
+) -> List[str]:
+    """
+    Return up to ``limit`` display names with a word starting with ``query``.
+
+    Queries shorter than MIN_SEARCH_CHARS return no matches.
+    """
+    prefix = (query or "").strip().lower()
+    if len(prefix) < MIN_SEARCH_CHARS:
+        return []
+
+    lo, hi = np.searchsorted(search_index.keys, [prefix, prefix + "\U0010ffff"])
+
+    matches = []
+    seen = set()
+    for position in search_index.positions[lo:hi].tolist():
+        if position in seen:
+            continue
+        seen.add(position)
+        matches.append(search_index.display_names[position])
+        if len(matches) == limit:
+            break
+
+    return matches
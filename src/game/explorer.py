@@ -2,20 +2,23 @@
 Explorer mode game logic.
 """
 
-from typing import Dict, Set, List, Any, Tuple
+from typing import Dict, List
+
+import numpy as np
 
 import streamlit as st
-import pandas as pd
 
-from .pathfinder import find_separation_path
+from ..data.loader import PlayerGraph, get_teammate_stats
+from ..data.search import PlayerSearchIndex
+from ..ui.components import render_player_matches, render_player_query
+from .pathfinder import cached_separation_path
 
 
 def render_explorer_mode(
-    display_names: List[str],
-    display_to_id: Dict[str, int],
-    player_id_to_name: Dict[int, str],
-    teammate_graph: Dict[int, Set[int]],
-    teammate_stats: Dict[Tuple[int, int], Dict[str, Any]],
+    search_index: PlayerSearchIndex,
+    display_to_idx: Dict[str, int],
+    player_names: np.ndarray,
+    player_graph: PlayerGraph,
 ) -> None:
     """Render the Explorer mode UI and handle user interactions."""
 
@@ -30,49 +33,48 @@ def render_explorer_mode(
     )
 
     col1, col2 = st.columns(2)
-
     with col1:
-        player1 = st.selectbox(
-            "First Player",
-            options=display_names,
-            index=None,
-            placeholder="🔍 Type to search...",
-            key="explorer_player1",
-        )
-
+        query1 = render_player_query("First Player", "explorer_player1")
     with col2:
-        player2 = st.selectbox(
-            "Second Player",
-            options=display_names,
-            index=None,
-            placeholder="🔍 Type to search...",
-            key="explorer_player2",
-        )
+        query2 = render_player_query("Second Player", "explorer_player2")
 
-    col_btn = st.columns([1, 2, 1])
-    with col_btn[1]:
-        find_button = st.button(
-            "🔍 Find Connection", type="primary", use_container_width=True
-        )
+    # Picking a player only takes effect on submit, instead of rerunning the
+    # whole script on every selection.
+    with st.form("explorer_form", border=False):
+        col1, col2 = st.columns(2)
+
+        with col1:
+            player1 = render_player_matches(
+                "First Player", "explorer_player1", query1, search_index
+            )
+
+        with col2:
+            player2 = render_player_matches(
+                "Second Player", "explorer_player2", query2, search_index
+            )
+
+        col_btn = st.columns([1, 2, 1])
+        with col_btn[1]:
+            find_button = st.form_submit_button(
+                "🔍 Find Connection", type="primary", use_container_width=True
+            )
 
     if find_button:
         _handle_find_connection(
             player1,
             player2,
-            display_to_id,
-            player_id_to_name,
-            teammate_graph,
-            teammate_stats,
+            display_to_idx,
+            player_names,
+            player_graph,
         )
 
 
 def _handle_find_connection(
     player1: str | None,
     player2: str | None,
-    display_to_id: Dict[str, int],
-    player_id_to_name: Dict[int, str],
-    teammate_graph: Dict[int, Set[int]],
-    teammate_stats: Dict[Tuple[int, int], Dict[str, Any]],
+    display_to_idx: Dict[str, int],
+    player_names: np.ndarray,
+    player_graph: PlayerGraph,
 ) -> None:
     """Handle the find connection button click."""
 
@@ -84,26 +86,26 @@ def _handle_find_connection(
         st.info("🤔 That's the same player! Select two different players.")
         return
 
-    start_id = display_to_id.get(player1)
-    end_id = display_to_id.get(player2)
+    start = display_to_idx.get(player1)
+    end = display_to_idx.get(player2)
 
-    if start_id is None or end_id is None:
+    if start is None or end is None:
         st.error("❌ Could not find one or both players.")
         return
 
     with st.spinner("🔍 Searching for connection..."):
-        path = find_separation_path(start_id, end_id, teammate_graph)
+        path = cached_separation_path(start, end, player_graph)
 
     if path:
-        display_path_result(path, player_id_to_name, teammate_stats)
+        display_path_result(path, player_names, player_graph)
     else:
         st.error("❌ No connection found between these players!")
 
 
 def display_path_result(
     path: List[int],
-    player_id_to_name: Dict[int, str],
-    teammate_stats: Dict[Tuple[int, int], Dict[str, Any]],
+    player_names: np.ndarray,
+    player_graph: PlayerGraph,
 ) -> None:
     """Display the connection path in a visually appealing way."""
     degrees = len(path) - 1
@@ -120,8 +122,8 @@ def display_path_result(
 
     st.markdown("### 🔗 Connection Chain")
 
-    for i, player_id in enumerate(path):
-        player_name = player_id_to_name.get(player_id, str(player_id))
+    for i, player in enumerate(path):
+        player_name = player_names[player]
         icon = "⚽ " if i == 0 or i == len(path) - 1 else "👤 "
 
         st.markdown(
@@ -130,25 +132,22 @@ def display_path_result(
         )
 
         if i < len(path) - 1:
-            _render_arrow_with_stats(player_id, path[i + 1], teammate_stats)
+            _render_arrow_with_stats(player, path[i + 1], player_graph)
 
 
 def _render_arrow_with_stats(
-    player_id: int,
-    next_player_id: int,
-    teammate_stats: Dict[Tuple[int, int], Dict[str, Any]],
+    player: int,
+    next_player: int,
+    player_graph: PlayerGraph,
 ) -> None:
     """Render the arrow connector with optional stats."""
-    stats = teammate_stats.get((player_id, next_player_id), {})
-
-    minutes = stats.get("minutes")
-    goals = stats.get("goals")
+    minutes, goals = get_teammate_stats(player_graph, player, next_player)
 
     stats_parts = []
-    if pd.notna(minutes) and minutes:
-        stats_parts.append(f"{int(minutes):,} mins together")
-    if pd.notna(goals) and goals:
-        stats_parts.append(f"{int(goals)} joint goals")
+    if minutes is not None:
+        stats_parts.append(f"{minutes:,} mins together")
+    if goals is not None:
+        stats_parts.append(f"{goals} joint goals")
 
     if stats_parts:
         stats_str = " • ".join(stats_parts)
@@ -2,39 +2,308 @@
 Pathfinding algorithm for finding player connections.
 """
 
-from collections import deque
-from typing import Dict, Set, List
+from typing import List, Tuple
+
+import numpy as np
+import streamlit as st
+from numba import njit
+
+from ..data.loader import PlayerGraph
+
+# BFS tree distance marking a node the search did not reach
+_UNREACHED = 255
+
+
+@njit(cache=True)
+def _expand_level(indptr, indices, visited, parent, queue, head, tail, side):
+    """
+    Expand one BFS level (``queue[head:tail]``) for the given search side.
+
+    ``visited`` is a ``(2, n_words)`` uint64 bitset, one row per side, so
+    ``side`` is 0 for the start side and 1 for the end side.
+
+    Returns:
+        Tuple of (new_tail, meet_from, meet_to); ``meet_from`` is -1 unless an
+        edge into a node already reached by the other side was found.
+    """
+    other = 1 - side
+    new_tail = tail
+    for i in range(head, tail):
+        current = queue[i]
+
+        for k in range(indptr[current], indptr[current + 1]):
+            neighbor = indices[k]
+            word = neighbor >> 6
+            bit = np.uint64(1) << np.uint64(neighbor & 63)
+            if visited[side, word] & bit:
+                continue
+            if visited[other, word] & bit:
+                return new_tail, current, neighbor
+
+            visited[side, word] |= bit
+            parent[neighbor] = current
+            queue[new_tail] = neighbor
+            new_tail += 1
+
+    return new_tail, -1, -1
+
+
+@njit(cache=True)
+def _splice_path(parent, start, end, start_side_node, end_side_node):
+    """Join the two half-paths that meet on the given edge."""
+    n_start = 1
+    node = start_side_node
+    while node != start:
+        node = parent[node]
+        n_start += 1
+
+    n_end = 1
+    node = end_side_node
+    while node != end:
+        node = parent[node]
+        n_end += 1
+
+    path = np.empty(n_start + n_end, dtype=np.int32)
+
+    node = start_side_node
+    for i in range(n_start - 1, 0, -1):
+        path[i] = node
+        node = parent[node]
+    path[0] = start
+
+    node = end_side_node
+    for i in range(n_start, n_start + n_end - 1):
+        path[i] = node
+        node = parent[node]
+    path[n_start + n_end - 1] = end
+
+    return path
+
+
+@njit(cache=True)
+def _bfs_csr(
+    indptr, indices, start, end, max_depth, visited, parent, queue_start, queue_end
+):
+    """
+    Bidirectional breadth-first search over a CSR graph.
+
+    Searches alternate level by level from whichever side has the smaller
+    frontier, so only ~2·b^(d/2) nodes are visited instead of b^d. Each side
+    marks the nodes it reached in its own row of the ``visited`` bitset, and
+    a single ``parent`` array serves both sides.
+
+    Once the two sides together have expanded ``max_depth`` levels, any
+    path still to be found would be longer than ``max_depth``, so the
+    search stops there.
+
+    The scratch arrays are reset and the path is reconstructed inside the
+    kernel, which holds the GIL throughout, so concurrent sessions can share
+    the same scratch buffers.
+
+    Returns:
+        int32 array of node indices from start to end (empty if unreachable)
+    """
+    visited.fill(0)
+    visited[0, start >> 6] |= np.uint64(1) << np.uint64(start & 63)
+    visited[1, end >> 6] |= np.uint64(1) << np.uint64(end & 63)
+    queue_start[0] = start
+    queue_end[0] = end
+    head_start, tail_start = 0, 1
+    head_end, tail_end = 0, 1
+    depth = 0
+
+    while head_start < tail_start and head_end < tail_end and depth < max_depth:
+        depth += 1
+        if tail_start - head_start <= tail_end - head_end:
+            new_tail, meet_from, meet_to = _expand_level(
+                indptr, indices, visited, parent, queue_start, head_start, tail_start, 0
+            )
+            head_start, tail_start = tail_start, new_tail
+            if meet_from >= 0:
+                return _splice_path(parent, start, end, meet_from, meet_to)
+        else:
+            new_tail, meet_from, meet_to = _expand_level(
+                indptr, indices, visited, parent, queue_end, head_end, tail_end, 1
+            )
+            head_end, tail_end = tail_end, new_tail
+            if meet_from >= 0:
+                return _splice_path(parent, start, end, meet_to, meet_from)
+
+    return np.empty(0, dtype=np.int32)
+
+
+@njit(cache=True)
+def _bfs_tree(indptr, indices, root, max_depth, dist, parent, queue):
+    """
+    Fill ``dist`` and ``parent`` with the BFS tree rooted at ``root``.
+
+    ``dist`` must be pre-filled with _UNREACHED, and nodes more than
+    ``max_depth`` hops away are left that way. The root is its own parent,
+    so following ``parent`` from any reached node ends at the root.
+    """
+    dist[root] = 0
+    parent[root] = root
+    queue[0] = root
+    head, tail = 0, 1
+
+    while head < tail:
+        current = queue[head]
+        head += 1
+        # The queue is ordered by distance, so the rest is just as deep
+        if dist[current] >= max_depth:
+            break
+        next_dist = dist[current] + 1
+        for k in range(indptr[current], indptr[current + 1]):
+            neighbor = indices[k]
+            if dist[neighbor] == _UNREACHED:
+                dist[neighbor] = next_dist
+                parent[neighbor] = current
+                queue[tail] = neighbor
+                tail += 1
+
+
+def _warm_up_kernels() -> None:
+    """
+    Compile the BFS kernels on a two-node graph.
+
+    Run at import so the first search a user triggers doesn't pay the JIT
+    compile (or on-disk cache load) cost. Numba specializes on whether an
+    array is writable, and the graph is a read-only memmap when it comes
+    from the on-disk data cache, so both variants of the graph arrays are
+    compiled; the scratch arrays are always writable.
+    """
+    for writable in (True, False):
+        indptr = np.array([0, 1, 2], dtype=np.int32)
+        indices = np.array([1, 0], dtype=np.int32)
+        indptr.setflags(write=writable)
+        indices.setflags(write=writable)
+
+        _bfs_csr(
+            indptr,
+            indices,
+            0,
+            1,
+            2,
+            np.zeros((2, 1), dtype=np.uint64),
+            np.zeros(2, dtype=np.int32),
+            np.zeros(2, dtype=np.int32),
+            np.zeros(2, dtype=np.int32),
+        )
+        _bfs_tree(
+            indptr,
+            indices,
+            0,
+            2,
+            np.full(2, _UNREACHED, dtype=np.uint8),
+            np.zeros(2, dtype=np.int32),
+            np.zeros(2, dtype=np.int32),
+        )
+
+
+_warm_up_kernels()
+
+
+@st.cache_resource(show_spinner=False)
+def _bfs_scratch(
+    n_nodes: int,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Allocate the visited, parent and queue buffers reused by every search."""
+    return (
+        np.zeros((2, (n_nodes + 63) // 64), dtype=np.uint64),
+        np.zeros(n_nodes, dtype=np.int32),
+        np.zeros(n_nodes, dtype=np.int32),
+        np.zeros(n_nodes, dtype=np.int32),
+    )
+
+
+def single_source_tree(
+    source: int, player_graph: PlayerGraph, max_depth: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Run a BFS from one player, stopping max_depth hops out.
+
+    Returns:
+        Tuple of (dist, parent): the uint8 hop count from source per player
+        (_UNREACHED beyond max_depth) and the int32 parent pointer towards
+        source; pass parent to tree_path to read off a path
+    """
+    n_nodes = len(player_graph.idx_to_id)
+    dist = np.full(n_nodes, _UNREACHED, dtype=np.uint8)
+    parent = np.empty(n_nodes, dtype=np.int32)
+    _bfs_tree(
+        player_graph.indptr,
+        player_graph.indices,
+        source,
+        max_depth,
+        dist,
+        parent,
+        # Kernels hold the GIL, so the shared search queue is free to borrow
+        _bfs_scratch(n_nodes)[2],
+    )
+    return dist, parent
+
+
+def tree_path(parent: np.ndarray, source: int, target: int) -> List[int]:
+    """Read the path from source to a reached target off a BFS tree."""
+    path = [target]
+    node = target
+    while node != source:
+        node = int(parent[node])
+        path.append(node)
+    path.reverse()
+    return path
 
 
 def find_separation_path(
-    start_id: int, end_id: int, teammate_graph: Dict[int, Set[int]]
+    start: int, end: int, player_graph: PlayerGraph, max_depth: int | None = None
 ) -> List[int] | None:
     """
-    Find the shortest path between two players using BFS.
+    Find the shortest path between two players using bidirectional BFS.
 
     Args:
-        start_id: Starting player's ID
-        end_id: Target player's ID
-        teammate_graph: Adjacency list of teammate connections
+        start: Starting player's index
+        end: Target player's index
+        player_graph: CSR teammate graph
+        max_depth: Longest separation worth finding; longer paths are
+            reported as missing without searching past this depth
 
     Returns:
-        List of player IDs representing the path, or None if no path exists
+        List of player indices representing the path, or None if no path
+        exists within max_depth
     """
-    if start_id == end_id:
-        return [start_id]
+    if start == end:
+        return [start]
 
-    queue = deque([(start_id, [start_id])])
-    visited = {start_id}
+    # Players in different components can never be connected
+    if player_graph.component[start] != player_graph.component[end]:
+        return None
 
-    while queue:
-        current_id, path = queue.popleft()
+    n_nodes = len(player_graph.idx_to_id)
+    if max_depth is None:
+        max_depth = n_nodes
 
-        for neighbor_id in teammate_graph.get(current_id, []):
-            if neighbor_id == end_id:
-                return path + [end_id]
+    path = _bfs_csr(
+        player_graph.indptr,
+        player_graph.indices,
+        start,
+        end,
+        max_depth,
+        *_bfs_scratch(n_nodes),
+    )
 
-            if neighbor_id not in visited:
-                visited.add(neighbor_id)
-                queue.append((neighbor_id, path + [neighbor_id]))
+    if len(path) == 0:
+        return None
+    return path.tolist()
 
-    return None
+
+@st.cache_data(max_entries=1024, show_spinner=False)
+def cached_separation_path(
+    start: int, end: int, _player_graph: PlayerGraph
+) -> List[int] | None:
+    """
+    Memoized find_separation_path for pairs users ask about directly.
+
+    The graph is loaded once per process and never changes, so it is left
+    out of the cache key (hence the leading underscore).
+    """
+    return find_separation_path(start, end, _player_graph)
@@ -2,33 +2,114 @@
 Quiz mode game logic.
 """
 
-import random
-from typing import Dict, Set, List, Tuple, Any
+from typing import Callable, Dict, List, Tuple, Any
 
+import numpy as np
 import streamlit as st
 
 from ..config import (
     DIFFICULTY_SETTINGS,
     MAX_QUIZ_ATTEMPTS,
     MIN_ELIGIBLE_PLAYERS,
+    QUIZ_BUCKET_SOURCES,
     MAX_HINT_LEVELS,
 )
-from .pathfinder import find_separation_path
+from ..data.loader import PlayerGraph
+from .pathfinder import find_separation_path, single_source_tree, tree_path
+
+_rng = np.random.default_rng()
+
+# BFS trees kept per get_random_quiz_players call, oldest evicted first
+_TREE_CACHE_SIZE = 8
+
+# Pairs kept per bucket source and distance when precomputing quiz pairs
+_BUCKET_TARGETS_PER_SOURCE = 64
+
+
+def _eligible_players(
+    player_graph: PlayerGraph, n_players: int, min_teammates: int, min_degrees: int
+) -> np.ndarray:
+    """Indices of profiled players with enough teammates to be quizzed on."""
+    # Components too small to hold a path min_degrees long can never qualify
+    reachable = player_graph.component_size[:n_players] > min_degrees
+
+    # Filter players by connection count (popularity proxy)
+    eligible_players = np.flatnonzero(
+        reachable & (player_graph.degree[:n_players] >= min_teammates)
+    )
+
+    # Fallback to all players if filter is too strict
+    if len(eligible_players) < MIN_ELIGIBLE_PLAYERS:
+        eligible_players = np.flatnonzero(reachable)
+
+    return eligible_players
+
+
+@st.cache_resource(show_spinner="🎯 Preparing quiz pairs...")
+def _distance_buckets(
+    difficulty: str, n_players: int, _player_graph: PlayerGraph
+) -> Dict[int, np.ndarray]:
+    """
+    Bucket eligible player pairs by separation for one difficulty.
+
+    Runs a BFS, bounded at the difficulty's max_degrees, from up to
+    QUIZ_BUCKET_SOURCES random eligible players and keeps at most
+    _BUCKET_TARGETS_PER_SOURCE targets per source and distance.
+
+    Returns:
+        Mapping from separation to an (n, 2) int32 array of (source, target)
+        player indices exactly that many degrees apart
+    """
+    settings = DIFFICULTY_SETTINGS.get(difficulty, DIFFICULTY_SETTINGS["Medium"])
+    min_degrees = settings["min_degrees"]
+    max_degrees = settings["max_degrees"]
+    eligible_players = _eligible_players(
+        _player_graph, n_players, settings["min_teammates"], min_degrees
+    )
+
+    n_sources = min(QUIZ_BUCKET_SOURCES, len(eligible_players))
+    sources = _rng.choice(eligible_players, size=n_sources, replace=False)
+
+    chunks: Dict[int, List[np.ndarray]] = {
+        d: [] for d in range(min_degrees, max_degrees + 1)
+    }
+    for source in sources.tolist():
+        dist, _ = single_source_tree(source, _player_graph, max_degrees)
+        target_dist = dist[eligible_players]
+        for d, pairs in chunks.items():
+            targets = eligible_players[target_dist == d]
+            if len(targets) > _BUCKET_TARGETS_PER_SOURCE:
+                targets = _rng.choice(
+                    targets, size=_BUCKET_TARGETS_PER_SOURCE, replace=False
+                )
+            bucket = np.empty((len(targets), 2), dtype=np.int32)
+            bucket[:, 0] = source
+            bucket[:, 1] = targets
+            pairs.append(bucket)
+
+    return {
+        d: np.concatenate(pairs) if pairs else np.empty((0, 2), dtype=np.int32)
+        for d, pairs in chunks.items()
+    }
 
 
 def get_random_quiz_players(
-    display_names: List[str],
-    display_to_id: Dict[str, int],
-    teammate_graph: Dict[int, Set[int]],
+    idx_to_display: np.ndarray,
+    n_players: int,
+    player_graph: PlayerGraph,
     difficulty: str = "Medium",
 ) -> Tuple[str | None, str | None, List[int] | None]:
     """
     Get two random players that have a valid connection based on difficulty.
 
+    Pairs are drawn from the precomputed distance buckets, so the separation
+    is right first time; random pairs are only tried if every bucket is
+    empty.
+
     Args:
-        display_names: List of player display names
-        display_to_id: Mapping from display name to player ID
-        teammate_graph: Adjacency list of teammate connections
+        idx_to_display: Display name per player index
+        n_players: Number of players with a profile (indices 0..n_players-1)
+        player_graph: CSR teammate graph used for pathfinding
         difficulty: Difficulty level (Easy, Medium, Hard)
 
     Returns:
@@ -37,34 +118,56 @@ def get_random_quiz_players(
     settings = DIFFICULTY_SETTINGS.get(difficulty, DIFFICULTY_SETTINGS["Medium"])
     min_degrees = settings["min_degrees"]
     max_degrees = settings["max_degrees"]
-    min_teammates = settings["min_teammates"]
 
-    # Filter players by connection count (popularity proxy)
-    eligible_players = [
-        display_name
-        for display_name in display_names
-        if (player_id := display_to_id.get(display_name))
-        and len(teammate_graph.get(player_id, [])) >= min_teammates
-    ]
-
-    # Fallback to all players if filter is too strict
-    if len(eligible_players) < MIN_ELIGIBLE_PLAYERS:
-        eligible_players = display_names
+    buckets = _distance_buckets(difficulty, n_players, player_graph)
+    distances = [d for d, pairs in buckets.items() if len(pairs)]
+    if distances:
+        pairs = buckets[_rng.choice(distances)]
+        player1, player2 = pairs[_rng.integers(len(pairs))].tolist()
+        # Sources come from a fixed sample, so pick which side goes first
+        if _rng.random() < 0.5:
+            player1, player2 = player2, player1
+
+        path = find_separation_path(
+            player1, player2, player_graph, max_depth=max_degrees
+        )
+        if path:
+            return idx_to_display[player1], idx_to_display[player2], path
+
+    eligible_players = _eligible_players(
+        player_graph, n_players, settings["min_teammates"], min_degrees
+    )
+    if len(eligible_players) < 2:
+        return None, None, None
 
+    component = player_graph.component
+    # One bounded BFS tree answers every pair drawn with the same source
+    trees: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
     for _ in range(MAX_QUIZ_ATTEMPTS):
-        player1_display = random.choice(eligible_players)
-        player2_display = random.choice(eligible_players)
+        player1, player2 = _rng.choice(
+            eligible_players, size=2, replace=False
+        ).tolist()
 
-        if player1_display == player2_display:
+        # Unreachable pairs are rejected without touching the pathfinder
+        if component[player1] != component[player2]:
             continue
 
-        player1_id = display_to_id.get(player1_display)
-        player2_id = display_to_id.get(player2_display)
+        # Separation is symmetric, so either player can be the source
+        if player1 not in trees and player2 in trees:
+            player1, player2 = player2, player1
 
-        if player1_id and player2_id:
-            path = find_separation_path(player1_id, player2_id, teammate_graph)
-            if path and min_degrees <= len(path) - 1 <= max_degrees:
-                return player1_display, player2_display, path
+        tree = trees.get(player1)
+        if tree is None:
+            if len(trees) >= _TREE_CACHE_SIZE:
+                del trees[next(iter(trees))]
+            tree = trees[player1] = single_source_tree(
+                player1, player_graph, max_degrees
+            )
+
+        dist, parent = tree
+        if min_degrees <= dist[player2] <= max_degrees:
+            path = tree_path(parent, player1, player2)
+            return idx_to_display[player1], idx_to_display[player2], path
 
     return None, None, None
 
@@ -85,14 +188,13 @@ def initialize_quiz_state() -> None:
     }
 
     for key, default_value in defaults.items():
-        if key not in st.session_state:
-            st.session_state[key] = default_value
+        st.session_state.setdefault(key, default_value)
 
 
 def start_new_quiz(
-    display_names: List[str],
-    display_to_id: Dict[str, int],
-    teammate_graph: Dict[int, Set[int]],
+    idx_to_display: np.ndarray,
+    n_players: int,
+    player_graph: PlayerGraph,
     difficulty: str,
 ) -> bool:
     """
@@ -102,7 +204,7 @@ def start_new_quiz(
         True if quiz was successfully started, False otherwise
     """
     player1, player2, path = get_random_quiz_players(
-        display_names, display_to_id, teammate_graph, difficulty
+        idx_to_display, n_players, player_graph, difficulty
     )
 
     if not path:
@@ -119,10 +221,38 @@ def start_new_quiz(
     return True
 
 
+def _age_hint(details: Dict[str, Any], name: str) -> str:
+    age = details.get("age")
+    return f"🎂 Age: **{age}** years old" if age else "🎂 Age: **Unknown**"
+
+
+# (hint level that reveals it, formatter taking player details and name)
+_HINT_SPEC: Tuple[Tuple[int, Callable[[Dict[str, Any], str], str]], ...] = (
+    (
+        0,
+        lambda details, name: (
+            f"📝 First letter: **{name[0]}**, Name length: **{len(name)}** characters"
+        ),
+    ),
+    (
+        1,
+        lambda details, name: (
+            f"🌍 Nationality: **{details.get('nationality', 'Unknown')}**"
+        ),
+    ),
+    (
+        2,
+        lambda details, name: f"🏟️ Current Club: **{details.get('club', 'Unknown')}**",
+    ),
+    (3, lambda details, name: f"⚽ Position: **{details.get('position', 'Unknown')}**"),
+    (4, _age_hint),
+)
+
+
 def build_hint_text(
-    player_id: int,
-    player_id_to_name: Dict[int, str],
-    player_details: Dict[int, Dict[str, Any]],
+    player: int,
+    player_names: np.ndarray,
+    get_player_details: Callable[[int], Dict[str, Any]],
     hint_level: int,
 ) -> Tuple[str, str]:
     """
@@ -131,35 +261,14 @@ def build_hint_text(
     Returns:
         Tuple of (hint_header, hint_text)
     """
-    correct_name = player_id_to_name.get(player_id, "Unknown")
-    details = player_details.get(player_id, {})
-
-    hints = []
+    correct_name = player_names[player]
+    details = get_player_details(player)
 
-    # Level 1: First letter + name length (always shown)
-    hints.append(
-        f"📝 First letter: **{correct_name[0]}**, Name length: **{len(correct_name)}** characters"
-    )
-
-    # Level 2: Nationality
-    if hint_level >= 1:
-        nationality = details.get("nationality", "Unknown")
-        hints.append(f"🌍 Nationality: **{nationality}**")
-
-    # Level 3: Current club
-    if hint_level >= 2:
-        club = details.get("club", "Unknown")
-        hints.append(f"🏟️ Current Club: **{club}**")
-
-    # Level 4: Position
-    if hint_level >= 3:
-        position = details.get("position", "Unknown")
-        hints.append(f"⚽ Position: **{position}**")
-
-    # Level 5: Age
-    if hint_level >= 4:
-        age = details.get("age")
-        hints.append(f"🎂 Age: **{age}** years old" if age else "🎂 Age: **Unknown**")
+    hints = [
+        format_hint(details, correct_name)
+        for min_level, format_hint in _HINT_SPEC
+        if hint_level >= min_level
+    ]
 
     hint_text = "<br>".join(hints)
     remaining = max(0, MAX_HINT_LEVELS - (hint_level + 1))
@@ -173,14 +282,14 @@ def build_hint_text(
     return hint_header, hint_text
 
 
-def check_guess(guess_id: int, correct_id: int, position: int) -> bool:
+def check_guess(guess: int, correct: int, position: int) -> bool:
     """
     Check if a guess is correct and update state accordingly.
 
     Returns:
         True if guess is correct, False otherwise
     """
-    if guess_id == correct_id:
+    if guess == correct:
         st.session_state.quiz_guessed[position] = True
         st.session_state.quiz_score += 1
         return True
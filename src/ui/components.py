@@ -3,11 +3,20 @@ Reusable UI components for The Separation Game.
 Enhanced with modern styling and theme support.
 """
 
-from typing import Dict, Set
+from functools import lru_cache
 
 import streamlit as st
 
-from ..config import APP_TITLE, APP_TAGLINE, THEMES, DEFAULT_THEME
+from ..config import (
+    APP_TITLE,
+    APP_TAGLINE,
+    THEMES,
+    DEFAULT_THEME,
+    MIN_SEARCH_CHARS,
+    DIFFICULTY_SETTINGS,
+)
+from ..data.loader import PlayerGraph
+from ..data.search import PlayerSearchIndex, search_players
 
 
 def get_current_theme_name() -> str:
@@ -30,13 +39,14 @@ def render_theme_toggle() -> None:
 
 
 def render_header(
-    display_names: list = None, teammate_graph: Dict[int, Set[int]] = None
+    display_names: list = None, player_graph: PlayerGraph = None
 ) -> None:
     """Render the hero header with optional stats."""
     stats_html = ""
-    if display_names and teammate_graph:
+    if display_names and player_graph is not None:
         player_count = len(display_names)
-        connection_count = sum(len(v) for v in teammate_graph.values()) // 2
+        # Every connection is stored once in each direction
+        connection_count = int(player_graph.indptr[-1]) // 2
         stats_html = f"""
         <div class="hero-stats">
             <div class="hero-stat">
@@ -107,10 +117,10 @@ def render_footer() -> None:
     )
 
 
-def render_stats_box(display_names: list, teammate_graph: Dict[int, Set[int]]) -> None:
+def render_stats_box(display_names: list, player_graph: PlayerGraph) -> None:
     """Render the stats box showing player and connection counts."""
     player_count = len(display_names)
-    connection_count = sum(len(v) for v in teammate_graph.values()) // 2
+    connection_count = int(player_graph.indptr[-1]) // 2
 
     st.markdown(
         f"""
@@ -123,6 +133,45 @@ def render_stats_box(display_names: list, teammate_graph: Dict[int, Set[int]]) -
     )
 
 
+def render_player_query(label: str, key: str) -> str:
+    """
+    Render the search box for a player picker.
+
+    Kept outside any form so the match list refreshes while typing.
+    """
+    return st.text_input(
+        label,
+        key=f"{key}_query",
+        placeholder=f"🔍 Type at least {MIN_SEARCH_CHARS} letters...",
+    )
+
+
+def render_player_matches(
+    label: str, key: str, query: str | None, search_index: PlayerSearchIndex
+) -> str | None:
+    """
+    Render a short list of players matching a search query.
+
+    Returns:
+        The selected player's display name, or None if nothing is selected
+    """
+    matches = search_players(query, search_index)
+
+    if not matches:
+        if query and query.strip():
+            st.caption("No matching players yet — keep typing.")
+        return None
+
+    return st.selectbox(
+        f"{label} matches",
+        options=matches,
+        index=None,
+        placeholder=f"Select from {len(matches)} matches...",
+        key=key,
+        label_visibility="collapsed",
+    )
+
+
 def render_mode_selector() -> str:
     """Render the game mode selector and return the selected mode."""
     mode = st.radio(
@@ -135,109 +184,132 @@ def render_mode_selector() -> str:
     return mode
 
 
-def render_game_card(icon: str, title: str, description: str) -> None:
-    """Render a game feature card."""
-    st.markdown(
-        f"""
+@lru_cache(maxsize=256)
+def _game_card_html(icon: str, title: str, description: str) -> str:
+    """Build the HTML for a game feature card."""
+    return f"""
         <div class="game-card">
             <div class="card-icon">{icon}</div>
             <h3>{title}</h3>
             <p>{description}</p>
         </div>
-        """,
-        unsafe_allow_html=True,
-    )
+        """
+
+
+def render_game_card(icon: str, title: str, description: str) -> None:
+    """Render a game feature card."""
+    st.markdown(_game_card_html(icon, title, description), unsafe_allow_html=True)
+
+
+@lru_cache(maxsize=256)
+def _player_node_html(
+    index: int, player_name: str, is_endpoint: bool, is_mystery: bool
+) -> str:
+    """Build the HTML for a player node in the connection chain."""
+    if is_mystery:
+        return f'<div class="player-node player-node-mystery">❓ <strong>{index}.</strong> ???</div>'
+    icon = "⚽" if is_endpoint else "✅"
+    return f'<div class="player-node">{icon} <strong>{index}.</strong> {player_name}</div>'
 
 
 def render_player_node(
     index: int, player_name: str, is_endpoint: bool = False, is_mystery: bool = False
 ) -> None:
     """Render a single player node in the connection chain."""
-    if is_mystery:
-        st.markdown(
-            f'<div class="player-node player-node-mystery">❓ <strong>{index}.</strong> ???</div>',
-            unsafe_allow_html=True,
-        )
-    else:
-        icon = "⚽" if is_endpoint else "✅"
-        st.markdown(
-            f'<div class="player-node">{icon} <strong>{index}.</strong> {player_name}</div>',
-            unsafe_allow_html=True,
-        )
+    st.markdown(
+        _player_node_html(index, player_name, is_endpoint, is_mystery),
+        unsafe_allow_html=True,
+    )
+
+
+@lru_cache(maxsize=256)
+def _arrow_html(show_stats: bool, stats_text: str) -> str:
+    """Build the HTML for an arrow connector between players."""
+    if show_stats and stats_text:
+        return f'<div class="arrow">⬇️ <em>played with</em><small>📊 {stats_text}</small></div>'
+    return '<div class="arrow">⬇️</div>'
 
 
 def render_arrow(show_stats: bool = False, stats_text: str = "") -> None:
     """Render an arrow connector between players."""
-    if show_stats and stats_text:
-        st.markdown(
-            f'<div class="arrow">⬇️ <em>played with</em><small>📊 {stats_text}</small></div>',
-            unsafe_allow_html=True,
-        )
-    else:
-        st.markdown(
-            '<div class="arrow">⬇️</div>',
-            unsafe_allow_html=True,
-        )
+    st.markdown(_arrow_html(show_stats, stats_text), unsafe_allow_html=True)
 
 
-def render_connection_result(degree: int, path_length: int) -> None:
-    """Render the connection result card."""
-    st.markdown(
-        f"""
+@lru_cache(maxsize=256)
+def _connection_result_html(degree: int, path_length: int) -> str:
+    """Build the HTML for the connection result card."""
+    return f"""
         <div class="connection-card">
             <h2>🎯 Connection Found!</h2>
             <div class="degree-badge">{degree} Degrees of Separation</div>
             <p style="margin-top: 1rem; opacity: 0.9;">{path_length} players in the chain</p>
         </div>
-        """,
-        unsafe_allow_html=True,
+        """
+
+
+def render_connection_result(degree: int, path_length: int) -> None:
+    """Render the connection result card."""
+    st.markdown(
+        _connection_result_html(degree, path_length), unsafe_allow_html=True
     )
 
 
+@lru_cache(maxsize=256)
+def _success_message_html(message: str) -> str:
+    """Build the HTML for a success message box."""
+    return f'<div class="success-guess">✅ {message}</div>'
+
+
 def render_success_message(message: str) -> None:
     """Render a success message box."""
-    st.markdown(
-        f'<div class="success-guess">✅ {message}</div>',
-        unsafe_allow_html=True,
-    )
+    st.markdown(_success_message_html(message), unsafe_allow_html=True)
+
+
+@lru_cache(maxsize=256)
+def _error_message_html(message: str) -> str:
+    """Build the HTML for an error message box."""
+    return f'<div class="wrong-guess">❌ {message}</div>'
 
 
 def render_error_message(message: str) -> None:
     """Render an error message box."""
-    st.markdown(
-        f'<div class="wrong-guess">❌ {message}</div>',
-        unsafe_allow_html=True,
-    )
+    st.markdown(_error_message_html(message), unsafe_allow_html=True)
+
+
+@lru_cache(maxsize=256)
+def _hint_box_html(header: str, content: str) -> str:
+    """Build the HTML for a hint box."""
+    return f'<div class="hint-box">💡 <strong>{header}</strong><br><br>{content}</div>'
 
 
 def render_hint_box(header: str, content: str) -> None:
     """Render a hint box with header and content."""
-    st.markdown(
-        f'<div class="hint-box">💡 <strong>{header}</strong><br><br>{content}</div>',
-        unsafe_allow_html=True,
-    )
+    st.markdown(_hint_box_html(header, content), unsafe_allow_html=True)
 
 
-def render_score_display(score: int, total: int) -> None:
-    """Render the score display."""
+@lru_cache(maxsize=256)
+def _score_display_html(score: int, total: int) -> str:
+    """Build the HTML for the score display."""
     percentage = (score / total * 100) if total > 0 else 0
-    st.markdown(
-        f"""
+    return f"""
         <div class="score-display">
             🏆 Score: {score} / {total} correct ({percentage:.0f}%)
         </div>
-        """,
-        unsafe_allow_html=True,
-    )
+        """
 
 
-def render_quiz_header(
+def render_score_display(score: int, total: int) -> None:
+    """Render the score display."""
+    st.markdown(_score_display_html(score, total), unsafe_allow_html=True)
+
+
+@lru_cache(maxsize=256)
+def _quiz_header_html(
     difficulty: str, difficulty_emoji: str, players_to_guess: int
-) -> None:
-    """Render the quiz challenge header."""
+) -> str:
+    """Build the HTML for the quiz challenge header."""
     plural = "s" if players_to_guess > 1 else ""
-    st.markdown(
-        f"""
+    return f"""
         <div class="quiz-header">
             <h3>🧩 Quiz Challenge {difficulty_emoji}</h3>
             <p style="margin: 0.5rem 0 0 0; opacity: 0.95;">
@@ -247,7 +319,15 @@ def render_quiz_header(
                 Find the {players_to_guess} player{plural} connecting these two!
             </p>
         </div>
-        """,
+        """
+
+
+def render_quiz_header(
+    difficulty: str, difficulty_emoji: str, players_to_guess: int
+) -> None:
+    """Render the quiz challenge header."""
+    st.markdown(
+        _quiz_header_html(difficulty, difficulty_emoji, players_to_guess),
         unsafe_allow_html=True,
     )
 
@@ -270,30 +350,38 @@ def render_quiz_players(player1_name: str, player2_name: str) -> None:
         )
 
 
+def _difficulty_card_html(name: str, settings: dict, is_active: bool) -> str:
+    """Build the HTML for a difficulty selector card."""
+    card_class = "difficulty-card difficulty-card-active" if is_active else "difficulty-card"
+    return f"""
+                <div class="{card_class}">
+                    <div class="difficulty-emoji">{settings['emoji']}</div>
+                    <div class="difficulty-name">{name}</div>
+                    <div class="difficulty-desc">{settings['description']}</div>
+                </div>
+                """
+
+
+# Card HTML per difficulty, keyed by whether the card is the active one
+_DIFFICULTY_CARDS = {
+    name: {
+        is_active: _difficulty_card_html(name, settings, is_active)
+        for is_active in (True, False)
+    }
+    for name, settings in DIFFICULTY_SETTINGS.items()
+}
+
+
 def render_difficulty_selector(current_difficulty: str) -> str:
     """Render difficulty selector cards. Returns selected difficulty."""
-    from ..config import DIFFICULTY_SETTINGS
-    
     st.markdown("### Select Difficulty")
     
     cols = st.columns(3)
     selected = current_difficulty
     
-    for idx, (name, settings) in enumerate(DIFFICULTY_SETTINGS.items()):
+    for idx, (name, cards) in enumerate(_DIFFICULTY_CARDS.items()):
         with cols[idx]:
-            is_active = name == current_difficulty
-            card_class = "difficulty-card difficulty-card-active" if is_active else "difficulty-card"
-            
-            st.markdown(
-                f"""
-                <div class="{card_class}">
-                    <div class="difficulty-emoji">{settings['emoji']}</div>
-                    <div class="difficulty-name">{name}</div>
-                    <div class="difficulty-desc">{settings['description']}</div>
-                </div>
-                """,
-                unsafe_allow_html=True,
-            )
+            st.markdown(cards[name == current_difficulty], unsafe_allow_html=True)
             
             if st.button(f"Select {name}", key=f"diff_{name}", use_container_width=True):
                 selected = name
@@ -301,15 +389,18 @@ def render_difficulty_selector(current_difficulty: str) -> str:
     return selected
 
 
-def render_progress_bar(current: int, total: int) -> None:
-    """Render a progress indicator for quiz guessing."""
+@lru_cache(maxsize=256)
+def _progress_bar_html(current: int, total: int) -> str:
+    """Build the HTML for the quiz progress indicator."""
     filled = "🟢" * current
     empty = "⚪" * (total - current)
-    st.markdown(
-        f"""
+    return f"""
         <div style="text-align: center; font-size: 1.25rem; margin: 0.5rem 0;">
             {filled}{empty} ({current}/{total} found)
         </div>
-        """,
-        unsafe_allow_html=True,
-    )
+        """
+
+
+def render_progress_bar(current: int, total: int) -> None:
+    """Render a progress indicator for quiz guessing."""
+    st.markdown(_progress_bar_html(current, total), unsafe_allow_html=True)
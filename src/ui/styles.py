@@ -3,15 +3,18 @@ CSS styles for The Separation Game.
 Enhanced with theme support, responsive design, and modern aesthetics.
 """
 
+import re
+from functools import lru_cache
+from string import Template
+
 import streamlit as st
 from ..config import THEMES, DEFAULT_THEME
 
 
 def get_current_theme() -> dict:
     """Get the current theme configuration."""
-    if "theme" not in st.session_state:
-        st.session_state.theme = DEFAULT_THEME
-    return THEMES.get(st.session_state.theme, THEMES[DEFAULT_THEME])
+    theme_key = st.session_state.setdefault("theme", DEFAULT_THEME)
+    return THEMES.get(theme_key, THEMES[DEFAULT_THEME])
 
 
 def toggle_theme() -> None:
@@ -24,84 +27,143 @@ def toggle_theme() -> None:
 
 def inject_styles() -> None:
     """Inject all CSS styles into the Streamlit app."""
-    theme = get_current_theme()
-    st.markdown(get_theme_styles(theme), unsafe_allow_html=True)
+    theme_key = st.session_state.setdefault("theme", DEFAULT_THEME)
+    # Streamlit drops elements a rerun does not emit, so both blocks are
+    # sent every time; the static one is identical across reruns and themes
+    st.markdown(_STATIC_STYLES, unsafe_allow_html=True)
+    st.markdown(get_theme_styles(theme_key), unsafe_allow_html=True)
+
+
+@lru_cache(maxsize=4)
+def get_theme_styles(theme_key: str) -> str:
+    """
+    Return the CSS variables for a theme.
+
+    Every rule in _STATIC_STYLES reads its colours from these variables, so
+    switching themes only swaps this small block. It is built once per
+    theme name and reused on every rerun.
+    """
+    theme = THEMES.get(theme_key, THEMES[DEFAULT_THEME])
+    return _THEME_VARIABLES.substitute(theme)
 
 
-def get_theme_styles(theme: dict) -> str:
-    """Return the complete CSS stylesheet with theme variables."""
-    return f"""
+def _minify_css(css: str) -> str:
+    """Strip comments and collapse the whitespace the browser ignores."""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    return re.sub(r"\s*([{}:;,])\s*", r"\1", css).strip()
+
+
+# $name placeholders are filled from the theme dict
+_THEME_VARIABLES = Template(
+    _minify_css(
+        """
 <style>
     /* ========================================
        CSS VARIABLES (Theme-based)
        ======================================== */
     
-    :root {{
-        --bg-primary: {theme['bg_primary']};
-        --bg-secondary: {theme['bg_secondary']};
-        --bg-tertiary: {theme['bg_tertiary']};
-        --text-primary: {theme['text_primary']};
-        --text-secondary: {theme['text_secondary']};
-        --text-muted: {theme['text_muted']};
-        --border-color: {theme['border']};
-        --accent: {theme['accent']};
-        --accent-dark: {theme['accent_dark']};
-        --success: {theme['success']};
-        --warning: {theme['warning']};
-        --error: {theme['error']};
-        --card-shadow: {theme['card_shadow']};
-    }}
+    :root {
+        --bg-primary: $bg_primary;
+        --bg-secondary: $bg_secondary;
+        --bg-tertiary: $bg_tertiary;
+        --text-primary: $text_primary;
+        --text-secondary: $text_secondary;
+        --text-muted: $text_muted;
+        --border-color: $border;
+        --accent: $accent;
+        --accent-dark: $accent_dark;
+        --success: $success;
+        --warning: $warning;
+        --error: $error;
+        --card-shadow: $card_shadow;
+    }
+</style>
+"""
+    )
+)
+
+# Pre-encoded SVG tile behind the hero header; substituted after minifying
+# so its attribute spacing is left untouched
+_HERO_PATTERN_URI = (
+    "data:image/svg+xml,"
+    "%3Csvg width='60' height='60' viewBox='0 0 60 60' "
+    "xmlns='http://www.w3.org/2000/svg'%3E"
+    "%3Cg fill='none' fill-rule='evenodd'%3E"
+    "%3Cg fill='%23ffffff' fill-opacity='0.05'%3E"
+    "%3Cpath d='M36 34v-4h-2v4h-4v2h4v4h2v-4h4v-2h-4zm0-30V0h-2v4h-4v2h4v4h2V6h4V4h-4z"
+    "M6 34v-4H4v4H0v2h4v4h2v-4h4v-2H6zM6 4V0H4v4H0v2h4v4h2V6h4V4H6z'/%3E"
+    "%3C/g%3E%3C/g%3E%3C/svg%3E"
+)
 
+# Theme-independent rules
+_STATIC_STYLES = Template(
+    _minify_css(
+        """
+<style>
     /* ========================================
        RESET & BASE STYLES
        ======================================== */
     
     /* Hide Streamlit branding */
-    #MainMenu {{visibility: hidden;}}
-    footer {{visibility: hidden;}}
-    header {{visibility: hidden;}}
+    #MainMenu {visibility: hidden;}
+    footer {visibility: hidden;}
+    header {visibility: hidden;}
     
     /* Smooth scrolling & transitions */
-    html {{
+    html {
         scroll-behavior: smooth;
-    }}
-    
-    * {{
+    }
+    
+    /* Themed surfaces without a transition of their own */
+    body,
+    .stApp,
+    .stApp > div,
+    .block-container,
+    .nav-bar,
+    .nav-title,
+    .game-card h3,
+    .game-card p,
+    .arrow,
+    .score-display,
+    .hint-box,
+    .stats-box,
+    .footer {
         transition: background-color 0.3s ease, color 0.3s ease, border-color 0.3s ease;
-    }}
+    }
     
     /* Override Streamlit background */
-    .stApp {{
+    .stApp {
         background-color: var(--bg-primary) !important;
-    }}
+    }
     
-    .stApp > div {{
+    .stApp > div {
         background-color: var(--bg-primary) !important;
-    }}
+    }
 
     /* ========================================
        LAYOUT & CONTAINER
        ======================================== */
     
-    .block-container {{
+    .block-container {
         padding-top: 1rem;
         padding-bottom: 2rem;
         max-width: 920px;
         background-color: var(--bg-primary);
-    }}
+    }
     
-    @media (max-width: 768px) {{
-        .block-container {{
+    @media (max-width: 768px) {
+        .block-container {
             padding-left: 1rem;
             padding-right: 1rem;
-        }}
-    }}
+        }
+    }
 
     /* ========================================
        NAVIGATION BAR
        ======================================== */
     
-    .nav-bar {{
+    .nav-bar {
         display: flex;
         justify-content: space-between;
         align-items: center;
@@ -111,24 +173,24 @@ def get_theme_styles(theme: dict) -> str:
         margin-bottom: 1.5rem;
         border: 1px solid var(--border-color);
         box-shadow: 0 2px 8px var(--card-shadow);
-    }}
+    }
     
-    .nav-title {{
+    .nav-title {
         font-size: 1.5rem;
         font-weight: 700;
         color: var(--text-primary);
         display: flex;
         align-items: center;
         gap: 0.5rem;
-    }}
+    }
     
-    .nav-actions {{
+    .nav-actions {
         display: flex;
         align-items: center;
         gap: 1rem;
-    }}
+    }
     
-    .theme-toggle {{
+    .theme-toggle {
         background: var(--bg-tertiary);
         border: 1px solid var(--border-color);
         border-radius: 50px;
@@ -137,19 +199,19 @@ def get_theme_styles(theme: dict) -> str:
         font-size: 1.1rem;
         transition: all 0.2s ease;
         color: var(--text-primary);
-    }}
+    }
     
-    .theme-toggle:hover {{
+    .theme-toggle:hover {
         background: var(--accent);
         color: white;
         border-color: var(--accent);
-    }}
+    }
 
     /* ========================================
        HERO HEADER
        ======================================== */
     
-    .hero-header {{
+    .hero-header {
         text-align: center;
         padding: 3rem 2rem;
         background: linear-gradient(135deg, #667eea 0%, #764ba2 50%, #f093fb 100%);
@@ -158,20 +220,20 @@ def get_theme_styles(theme: dict) -> str:
         position: relative;
         overflow: hidden;
         box-shadow: 0 12px 40px rgba(102, 126, 234, 0.3);
-    }}
+    }
     
-    .hero-header::before {{
+    .hero-header::before {
         content: '';
         position: absolute;
         top: 0;
         left: 0;
         right: 0;
         bottom: 0;
-        background: url("data:image/svg+xml,%3Csvg width='60' height='60' viewBox='0 0 60 60' xmlns='http://www.w3.org/2000/svg'%3E%3Cg fill='none' fill-rule='evenodd'%3E%3Cg fill='%23ffffff' fill-opacity='0.05'%3E%3Cpath d='M36 34v-4h-2v4h-4v2h4v4h2v-4h4v-2h-4zm0-30V0h-2v4h-4v2h4v4h2V6h4V4h-4zM6 34v-4H4v4H0v2h4v4h2v-4h4v-2H6zM6 4V0H4v4H0v2h4v4h2V6h4V4H6z'/%3E%3C/g%3E%3C/g%3E%3C/svg%3E");
+        background: url("$hero_pattern");
         opacity: 0.5;
-    }}
+    }
     
-    .hero-header h1 {{
+    .hero-header h1 {
         color: #ffffff;
         font-size: 2.75rem;
         margin: 0;
@@ -180,63 +242,63 @@ def get_theme_styles(theme: dict) -> str:
         z-index: 1;
         font-weight: 800;
         letter-spacing: -0.5px;
-    }}
+    }
     
-    .hero-header p {{
+    .hero-header p {
         color: rgba(255, 255, 255, 0.9);
         font-size: 1.15rem;
         margin-top: 0.75rem;
         position: relative;
         z-index: 1;
         font-weight: 400;
-    }}
+    }
     
-    .hero-stats {{
+    .hero-stats {
         display: flex;
         justify-content: center;
         gap: 2rem;
         margin-top: 1.5rem;
         position: relative;
         z-index: 1;
-    }}
+    }
     
-    .hero-stat {{
+    .hero-stat {
         background: rgba(255, 255, 255, 0.15);
         backdrop-filter: blur(10px);
         padding: 0.75rem 1.5rem;
         border-radius: 12px;
         border: 1px solid rgba(255, 255, 255, 0.2);
-    }}
+    }
     
-    .hero-stat-value {{
+    .hero-stat-value {
         font-size: 1.5rem;
         font-weight: 700;
         color: white;
-    }}
+    }
     
-    .hero-stat-label {{
+    .hero-stat-label {
         font-size: 0.85rem;
         color: rgba(255, 255, 255, 0.8);
-    }}
+    }
     
-    @media (max-width: 768px) {{
-        .hero-header h1 {{
+    @media (max-width: 768px) {
+        .hero-header h1 {
             font-size: 2rem;
-        }}
-        .hero-header p {{
+        }
+        .hero-header p {
             font-size: 1rem;
-        }}
-        .hero-stats {{
+        }
+        .hero-stats {
             flex-direction: column;
             gap: 0.75rem;
-        }}
-    }}
+        }
+    }
 
     /* ========================================
        MODE TABS (Navigation)
        ======================================== */
     
-    .mode-tabs {{
+    .mode-tabs {
         display: flex;
         gap: 0.5rem;
         background: var(--bg-secondary);
@@ -244,9 +306,9 @@ def get_theme_styles(theme: dict) -> str:
         border-radius: 16px;
         margin-bottom: 1.5rem;
         border: 1px solid var(--border-color);
-    }}
+    }
     
-    .mode-tab {{
+    .mode-tab {
         flex: 1;
         padding: 1rem 1.5rem;
         border-radius: 12px;
@@ -260,29 +322,29 @@ def get_theme_styles(theme: dict) -> str:
         justify-content: center;
         gap: 0.5rem;
         text-decoration: none;
-    }}
+    }
     
-    .mode-tab-inactive {{
+    .mode-tab-inactive {
         background: transparent;
         color: var(--text-muted);
-    }}
+    }
     
-    .mode-tab-inactive:hover {{
+    .mode-tab-inactive:hover {
         background: var(--bg-tertiary);
         color: var(--text-primary);
-    }}
+    }
     
-    .mode-tab-active {{
+    .mode-tab-active {
         background: linear-gradient(135deg, var(--accent) 0%, var(--accent-dark) 100%);
         color: white;
         box-shadow: 0 4px 12px rgba(102, 126, 234, 0.3);
-    }}
+    }
 
     /* ========================================
        CARD STYLES
        ======================================== */
     
-    .game-card {{
+    .game-card {
         background: var(--bg-secondary);
         border-radius: 16px;
         padding: 1.5rem;
@@ -290,36 +352,36 @@ def get_theme_styles(theme: dict) -> str:
         margin: 1rem 0;
         border: 1px solid var(--border-color);
         transition: transform 0.2s ease, box-shadow 0.2s ease;
-    }}
+    }
     
-    .game-card:hover {{
+    .game-card:hover {
         transform: translateY(-2px);
         box-shadow: 0 8px 24px var(--card-shadow);
-    }}
+    }
     
-    .game-card h3 {{
+    .game-card h3 {
         color: var(--text-primary);
         font-size: 1.25rem;
         margin-bottom: 0.5rem;
         font-weight: 600;
-    }}
+    }
     
-    .game-card p {{
+    .game-card p {
         color: var(--text-muted);
         margin: 0;
         line-height: 1.5;
-    }}
+    }
     
-    .card-icon {{
+    .card-icon {
         font-size: 2rem;
         margin-bottom: 0.75rem;
-    }}
+    }
 
     /* ========================================
        CONNECTION RESULT CARD
        ======================================== */
     
-    .connection-card {{
+    .connection-card {
         background: linear-gradient(135deg, var(--accent) 0%, var(--accent-dark) 100%);
         padding: 2rem;
         border-radius: 20px;
@@ -329,9 +391,9 @@ def get_theme_styles(theme: dict) -> str:
         box-shadow: 0 12px 40px rgba(102, 126, 234, 0.35);
         position: relative;
         overflow: hidden;
-    }}
+    }
     
-    .connection-card::before {{
+    .connection-card::before {
         content: '';
         position: absolute;
         top: -50%;
@@ -339,76 +401,76 @@ def get_theme_styles(theme: dict) -> str:
         width: 100%;
         height: 100%;
         background: radial-gradient(circle, rgba(255,255,255,0.1) 0%, transparent 60%);
-    }}
+    }
     
-    .connection-card h2 {{
+    .connection-card h2 {
         margin: 0 0 1rem 0;
         font-size: 1.75rem;
         position: relative;
         z-index: 1;
         font-weight: 700;
-    }}
+    }
 
     /* ========================================
        PLAYER NODE STYLES
        ======================================== */
     
-    .player-node {{
+    .player-node {
         background: var(--bg-secondary);
         padding: 1rem 1.25rem;
         border-radius: 12px;
-        border-left: 4px solid var(--accent);
+        border: 1px solid var(--border-color);
+        border-left-width: 4px;
+        border-left-color: var(--accent);
         margin: 0.5rem 0;
         font-weight: 500;
         font-size: 1rem;
         color: var(--text-primary);
         box-shadow: 0 2px 8px var(--card-shadow);
         transition: all 0.2s ease;
-        border: 1px solid var(--border-color);
-        border-left: 4px solid var(--accent);
-    }}
+    }
     
-    .player-node:hover {{
+    .player-node:hover {
         border-left-color: var(--accent-dark);
         transform: translateX(4px);
         box-shadow: 0 4px 12px var(--card-shadow);
-    }}
+    }
     
-    .player-node-mystery {{
+    .player-node-mystery {
         background: linear-gradient(135deg, #fef3c7 0%, #fde68a 100%);
         border-left-color: #f59e0b;
         color: #92400e;
-    }}
+    }
 
     /* ========================================
        ARROW CONNECTOR
        ======================================== */
     
-    .arrow {{
+    .arrow {
         text-align: center;
         color: var(--accent);
         font-size: 1.1rem;
         margin: 0.75rem 0;
         line-height: 1.5;
-    }}
+    }
     
-    .arrow em {{
+    .arrow em {
         color: var(--text-muted);
         font-size: 0.9rem;
-    }}
+    }
     
-    .arrow small {{
+    .arrow small {
         display: block;
         color: var(--text-muted);
         font-size: 0.8rem;
         margin-top: 0.25rem;
-    }}
+    }
 
     /* ========================================
        DEGREE BADGE
        ======================================== */
     
-    .degree-badge {{
+    .degree-badge {
         background: linear-gradient(135deg, var(--success) 0%, #059669 100%);
         color: white;
         padding: 0.75rem 1.75rem;
@@ -417,13 +479,13 @@ def get_theme_styles(theme: dict) -> str:
         font-size: 1.1rem;
         display: inline-block;
         box-shadow: 0 4px 16px rgba(16, 185, 129, 0.4);
-    }}
+    }
 
     /* ========================================
        QUIZ MODE STYLES
        ======================================== */
     
-    .quiz-header {{
+    .quiz-header {
         background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%);
         padding: 2rem;
         border-radius: 20px;
@@ -431,20 +493,20 @@ def get_theme_styles(theme: dict) -> str:
         text-align: center;
         margin: 1rem 0;
         box-shadow: 0 8px 32px rgba(245, 87, 108, 0.3);
-    }}
+    }
     
-    .quiz-header h3 {{
+    .quiz-header h3 {
         margin: 0;
         font-size: 1.5rem;
         font-weight: 700;
-    }}
+    }
     
-    .quiz-header p {{
+    .quiz-header p {
         margin: 0.5rem 0 0 0;
         opacity: 0.95;
-    }}
+    }
     
-    .quiz-player-card {{
+    .quiz-player-card {
         background: linear-gradient(135deg, #1a1a2e 0%, #16213e 100%);
         padding: 1.5rem 1rem;
         border-radius: 16px;
@@ -455,20 +517,20 @@ def get_theme_styles(theme: dict) -> str:
         box-shadow: 0 4px 16px rgba(0, 0, 0, 0.2);
         transition: transform 0.2s ease;
         border: 1px solid rgba(255,255,255,0.1);
-    }}
+    }
     
-    .quiz-player-card:hover {{
+    .quiz-player-card:hover {
         transform: scale(1.02);
-    }}
+    }
     
-    @media (max-width: 768px) {{
-        .quiz-player-card {{
+    @media (max-width: 768px) {
+        .quiz-player-card {
             font-size: 0.9rem;
             padding: 1rem 0.75rem;
-        }}
-    }}
+        }
+    }
     
-    .quiz-vs {{
+    .quiz-vs {
         text-align: center;
         font-size: 2rem;
         color: var(--accent);
@@ -477,19 +539,19 @@ def get_theme_styles(theme: dict) -> str:
         display: flex;
         align-items: center;
         justify-content: center;
-    }}
+    }
 
     /* ========================================
        DIFFICULTY SELECTOR
        ======================================== */
     
-    .difficulty-cards {{
+    .difficulty-cards {
         display: flex;
         gap: 1rem;
         margin: 1rem 0;
-    }}
+    }
     
-    .difficulty-card {{
+    .difficulty-card {
         flex: 1;
         padding: 1.25rem;
         border-radius: 12px;
@@ -498,40 +560,40 @@ def get_theme_styles(theme: dict) -> str:
         cursor: pointer;
         transition: all 0.2s ease;
         text-align: center;
-    }}
+    }
     
-    .difficulty-card:hover {{
+    .difficulty-card:hover {
         border-color: var(--accent);
         transform: translateY(-2px);
-    }}
+    }
     
-    .difficulty-card-active {{
+    .difficulty-card-active {
         border-color: var(--accent);
         background: linear-gradient(135deg, rgba(102, 126, 234, 0.1) 0%, rgba(118, 75, 162, 0.1) 100%);
         box-shadow: 0 4px 12px rgba(102, 126, 234, 0.2);
-    }}
+    }
     
-    .difficulty-emoji {{
+    .difficulty-emoji {
         font-size: 2rem;
         margin-bottom: 0.5rem;
-    }}
+    }
     
-    .difficulty-name {{
+    .difficulty-name {
         font-weight: 600;
         color: var(--text-primary);
         margin-bottom: 0.25rem;
-    }}
+    }
     
-    .difficulty-desc {{
+    .difficulty-desc {
         font-size: 0.85rem;
         color: var(--text-muted);
-    }}
+    }
 
     /* ========================================
        SCORE & FEEDBACK STYLES
        ======================================== */
     
-    .score-display {{
+    .score-display {
         background: linear-gradient(135deg, #ffecd2 0%, #fcb69f 100%);
         padding: 1rem 2rem;
         border-radius: 12px;
@@ -541,9 +603,9 @@ def get_theme_styles(theme: dict) -> str:
         color: #744210;
         margin: 1rem 0;
         box-shadow: 0 4px 12px rgba(252, 182, 159, 0.4);
-    }}
+    }
     
-    .hint-box {{
+    .hint-box {
         background: linear-gradient(135deg, #fffbeb 0%, #fef3c7 100%);
         border: 2px solid var(--warning);
         border-radius: 12px;
@@ -551,13 +613,13 @@ def get_theme_styles(theme: dict) -> str:
         margin: 0.75rem 0;
         line-height: 1.8;
         color: #92400e;
-    }}
+    }
     
-    .hint-box strong {{
+    .hint-box strong {
         color: #78350f;
-    }}
+    }
     
-    .success-guess {{
+    .success-guess {
         background: linear-gradient(135deg, #d1fae5 0%, #a7f3d0 100%);
         border: 2px solid var(--success);
         border-radius: 12px;
@@ -566,9 +628,9 @@ def get_theme_styles(theme: dict) -> str:
         color: #065f46;
         font-weight: 600;
         font-size: 1.1rem;
-    }}
+    }
     
-    .wrong-guess {{
+    .wrong-guess {
         background: linear-gradient(135deg, #fee2e2 0%, #fecaca 100%);
         border: 2px solid var(--error);
         border-radius: 12px;
@@ -576,13 +638,13 @@ def get_theme_styles(theme: dict) -> str:
         text-align: center;
         color: #991b1b;
         font-weight: 500;
-    }}
+    }
 
     /* ========================================
        STATS BOX
        ======================================== */
     
-    .stats-box {{
+    .stats-box {
         background: var(--bg-secondary);
         border: 1px solid var(--border-color);
         border-radius: 12px;
@@ -591,174 +653,176 @@ def get_theme_styles(theme: dict) -> str:
         margin: 1rem 0;
         font-size: 1rem;
         color: var(--text-secondary);
-    }}
+    }
     
-    .stats-box strong {{
+    .stats-box strong {
         color: var(--accent);
-    }}
+    }
 
     /* ========================================
        BUTTON STYLES
        ======================================== */
     
-    .stButton > button {{
+    .stButton > button {
         border-radius: 12px !important;
         padding: 0.75rem 2rem !important;
         font-weight: 600 !important;
         transition: all 0.2s ease !important;
         border: none !important;
         font-size: 0.95rem !important;
-    }}
+    }
     
-    .stButton > button:hover {{
+    .stButton > button:hover {
         transform: translateY(-2px);
         box-shadow: 0 6px 20px rgba(0, 0, 0, 0.15) !important;
-    }}
+    }
     
-    .stButton > button:active {{
+    .stButton > button:active {
         transform: translateY(0);
-    }}
+    }
     
-    .stButton > button[kind="primary"] {{
+    .stButton > button[kind="primary"] {
         background: linear-gradient(135deg, var(--accent) 0%, var(--accent-dark) 100%) !important;
         color: white !important;
-    }}
+    }
     
-    .stButton > button[kind="secondary"] {{
+    .stButton > button[kind="secondary"] {
         background: var(--bg-tertiary) !important;
         color: var(--text-primary) !important;
         border: 1px solid var(--border-color) !important;
-    }}
+    }
 
     /* ========================================
        FORM ELEMENTS
        ======================================== */
     
-    .stSelectbox > div > div {{
+    .stSelectbox > div > div {
         border-radius: 12px !important;
         border-color: var(--border-color) !important;
         background: var(--bg-secondary) !important;
-    }}
+    }
     
-    .stSelectbox label {{
+    .stSelectbox label {
         color: var(--text-primary) !important;
-    }}
+    }
     
-    .stRadio > div {{
+    .stRadio > div {
         background: var(--bg-secondary);
         padding: 0.5rem;
         border-radius: 12px;
         border: 1px solid var(--border-color);
-    }}
+    }
     
-    .stRadio label {{
+    .stRadio label {
         color: var(--text-primary) !important;
-    }}
+    }
 
     /* ========================================
        FOOTER STYLES
        ======================================== */
     
-    .footer {{
+    .footer {
         text-align: center;
         color: var(--text-muted);
         font-size: 0.85rem;
         padding: 2rem 0 1rem 0;
         border-top: 1px solid var(--border-color);
         margin-top: 3rem;
-    }}
+    }
     
-    .footer a {{
+    .footer a {
         color: var(--accent);
         text-decoration: none;
-    }}
+    }
     
-    .footer a:hover {{
+    .footer a:hover {
         text-decoration: underline;
-    }}
+    }
 
     /* ========================================
        RESPONSIVE ADJUSTMENTS
        ======================================== */
     
-    @media (max-width: 480px) {{
-        .hero-header {{
+    @media (max-width: 480px) {
+        .hero-header {
             padding: 2rem 1rem;
-        }}
+        }
         
-        .game-card {{
+        .game-card {
             padding: 1rem;
-        }}
+        }
         
-        .connection-card {{
+        .connection-card {
             padding: 1.5rem 1rem;
-        }}
+        }
         
-        .quiz-header {{
+        .quiz-header {
             padding: 1.5rem 1rem;
-        }}
+        }
         
-        .degree-badge {{
+        .degree-badge {
             padding: 0.5rem 1.25rem;
             font-size: 1rem;
-        }}
+        }
         
-        .stButton > button {{
+        .stButton > button {
             padding: 0.6rem 1.5rem !important;
-        }}
+        }
         
-        .difficulty-cards {{
+        .difficulty-cards {
             flex-direction: column;
-        }}
-    }}
+        }
+    }
 
     /* ========================================
        ANIMATIONS
        ======================================== */
     
-    @keyframes fadeIn {{
-        from {{ opacity: 0; transform: translateY(10px); }}
-        to {{ opacity: 1; transform: translateY(0); }}
-    }}
+    @keyframes fadeIn {
+        from { opacity: 0; transform: translateY(10px); }
+        to { opacity: 1; transform: translateY(0); }
+    }
     
-    @keyframes slideIn {{
-        from {{ opacity: 0; transform: translateX(-20px); }}
-        to {{ opacity: 1; transform: translateX(0); }}
-    }}
+    @keyframes slideIn {
+        from { opacity: 0; transform: translateX(-20px); }
+        to { opacity: 1; transform: translateX(0); }
+    }
     
-    @keyframes pulse {{
-        0%, 100% {{ transform: scale(1); }}
-        50% {{ transform: scale(1.05); }}
-    }}
+    @keyframes pulse {
+        0%, 100% { transform: scale(1); }
+        50% { transform: scale(1.05); }
+    }
     
-    .game-card, .connection-card, .quiz-header {{
+    .game-card, .connection-card, .quiz-header {
         animation: fadeIn 0.3s ease-out;
-    }}
+    }
     
-    .player-node {{
+    .player-node {
         animation: slideIn 0.3s ease-out;
-    }}
+    }
 
     /* ========================================
        SCROLLBAR STYLING
        ======================================== */
     
-    ::-webkit-scrollbar {{
+    ::-webkit-scrollbar {
         width: 8px;
         height: 8px;
-    }}
+    }
     
-    ::-webkit-scrollbar-track {{
+    ::-webkit-scrollbar-track {
         background: var(--bg-secondary);
-    }}
+    }
     
-    ::-webkit-scrollbar-thumb {{
+    ::-webkit-scrollbar-thumb {
         background: var(--text-muted);
         border-radius: 4px;
-    }}
+    }
     
-    ::-webkit-scrollbar-thumb:hover {{
+    ::-webkit-scrollbar-thumb:hover {
         background: var(--text-secondary);
-    }}
+    }
 </style>
 """
+    )
+).substitute(hero_pattern=_HERO_PATTERN_URI)